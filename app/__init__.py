@@ -1,3 +1,10 @@
-from .main import app
-
 __all__ = ["app"]
+
+
+def __getattr__(name: str):
+    # Build the app only when it is asked for, so importing a submodule such
+    # as app.config does not construct the whole application
+    if name == "app":
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
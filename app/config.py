@@ -1,65 +1,161 @@
-import yaml
-from pydantic import BaseModel
-from typing import List
-from pathlib import Path
+import hashlib
+import os
+import tempfile
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
 
 
-class AppSettings(BaseModel):
+class ConfigModel(BaseModel):
+    """Base for settings sections: immutable after load, unknown keys rejected"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
+class AppSettings(ConfigModel):
     title: str
     description: str
     version: str
     host: str
     port: int
+    base_url: Optional[str] = None
 
 
-class ApiEndpoints(BaseModel):
+class ApiEndpoints(ConfigModel):
     root: str
     truth: str
     health: str
 
 
-class ApiConfig(BaseModel):
+class ApiConfig(ConfigModel):
     endpoints: ApiEndpoints
 
 
-class FileSettings(BaseModel):
+class FileSettings(ConfigModel):
     truth_file_path: str
 
 
-class RateLimitSettings(BaseModel):
+class RateLimitSettings(ConfigModel):
     max_requests: int
     window_seconds: int
 
 
-class CorsSettings(BaseModel):
+class CorsSettings(ConfigModel):
     allow_origins: List[str]
     allow_credentials: bool
     allow_methods: List[str]
     allow_headers: List[str]
 
 
-class LoggingSettings(BaseModel):
+class HeadersSettings(ConfigModel):
+    truth_cache_control: str = "public, max-age=86400, immutable"
+
+
+class LoggingSettings(ConfigModel):
     level: str
 
 
-class Settings(BaseModel):
+class Settings(ConfigModel):
     app: AppSettings
     api: ApiConfig
     files: FileSettings
     rate_limit: RateLimitSettings
     cors: CorsSettings
+    headers: HeadersSettings = HeadersSettings()
     logging: LoggingSettings
 
 
+class _SettingsCache(BaseModel):
+    """On-disk cache: the validated settings plus what they were built from"""
+    source: str
+    settings: Settings
+
+
+def _schema_signature(model: type) -> str:
+    """Describe a settings model's fields, recursing into nested sections"""
+    fields = []
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            annotation = _schema_signature(annotation)
+        fields.append(f"{name}:{annotation!r}={field.default!r}")
+    return f"{model.__name__}({','.join(fields)})"
+
+
+def _cache_source(config_path: str) -> str:
+    """
+    Identify the YAML file and settings schema a cache entry was built from
+
+    Uses the exact mtime and size rather than "cache newer than YAML", since
+    copies that preserve mtimes (cp -p, rsync -t, tar, image builds) would
+    otherwise leave an edited file shadowed by a stale cache.
+    """
+    stat = os.stat(config_path)
+    schema = hashlib.sha1(_schema_signature(Settings).encode("utf-8")).hexdigest()
+    return f"{stat.st_mtime_ns}:{stat.st_size}:{schema}"
+
+
 def load_settings(config_path: str = "settings.yaml") -> Settings:
     """
     Load settings from YAML file
+
+    The validated settings are cached as JSON next to the YAML file and reused
+    while the YAML file and the settings schema are unchanged. Set
+    TRUTH_API_NO_CACHE to always parse the YAML.
     """
-    with open(config_path, 'r', encoding='utf-8') as file:
-        config_data = yaml.safe_load(file)
+    use_cache = not os.environ.get("TRUTH_API_NO_CACHE")
+    cache_path = config_path + ".cache.json"
+
+    source = None
+    if use_cache:
+        try:
+            source = _cache_source(config_path)
+            with open(cache_path, 'rb') as file:
+                cache = _SettingsCache.model_validate_json(file.read())
+            if cache.source == source:
+                return cache.settings
+        except (OSError, ValueError):
+            pass
+
+    import yaml
+
+    try:
+        from yaml import CSafeLoader as _Loader
+    except ImportError:
+        from yaml import SafeLoader as _Loader
+
+    with open(config_path, 'rb') as file:
+        config_data = yaml.load(file, Loader=_Loader)
     
-    return Settings(**config_data)
+    settings = Settings.model_validate(config_data)
+
+    if source is not None:
+        _write_cache(cache_path, _SettingsCache(source=source, settings=settings))
+
+    return settings
+
+
+def _write_cache(cache_path: str, cache: _SettingsCache) -> None:
+    """Atomically write the settings cache, skipping unwritable locations"""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".")
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(cache.model_dump_json().encode('utf-8'))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        os.unlink(tmp_path)
+
+
+# Global settings instance, loaded on first access of ``settings``
+_settings = None
 
 
-# Global settings instance
-settings = load_settings()
+def __getattr__(name: str):
+    global _settings
+    if name == "settings":
+        if _settings is None:
+            _settings = load_settings()
+        return _settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,26 +1,78 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, PlainTextResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+from collections import Counter
 from contextlib import asynccontextmanager
-import json
-import random
+import html
+import itertools
+import logging
+import mmap
+import orjson
+import time
 from datetime import datetime
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 from .config import settings
-from .routes.truth_routes import router as truth_router
+from .middleware import (
+    FastPathMiddleware, RateLimitMiddleware, WildcardCORSMiddleware, describe_rate_limit
+)
+from .models import TruthCorpus
+from .routes.truth_routes import (
+    build_truth_etags, build_truth_pages, compress_truth_pages, get_random_truth,
+    router as truth_router,
+)
 
 
-# Initialize limiter globally
-limiter = Limiter(key_func=get_remote_address)
+logger = logging.getLogger(__name__)
+
+
+class TruthFileError(Exception):
+    """Raised when the truth file is missing, not valid JSON or malformed"""
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    app.state.truths = load_truths()
-    app.state.hit_counter = 0  # Initialize hit counter
+    try:
+        truths = load_truths()
+        app.state.ready = True
+    except TruthFileError as exc:
+        # Keep serving (health reports "degraded") instead of crash-looping
+        # the deployment until the data is fixed
+        logger.error("%s; starting without truths", exc)
+        truths = []
+        app.state.ready = False
+    # Column layout of the corpus: parallel tuples indexed by position
+    truth_ids = tuple(t["id"] for t in truths)
+    truth_texts = tuple(t["truth"] for t in truths)
+    # The parsed row dicts are not needed once the columns exist; this frame
+    # lives as long as the app, so release them explicitly
+    del truths
+    # HTML-escaped copies for the truth page; the corpus never changes
+    truth_ids_html = tuple(html.escape(truth_id) for truth_id in truth_ids)
+    truth_texts_html = tuple(html.escape(text) for text in truth_texts)
+    # With a fixed public URL every truth page can be rendered up front
+    # and compressed once, instead of per response
+    truth_pages = truth_pages_gzip = None
+    if settings.app.base_url:
+        truth_pages = build_truth_pages(settings.app.base_url, truth_ids_html, truth_texts_html)
+        truth_pages_gzip = compress_truth_pages(truth_pages)
+    etags_html, etags_gzip = build_truth_etags(
+        truth_ids, truth_texts, settings.app.base_url
+    )
+    app.state.corpus = TruthCorpus(
+        ids=truth_ids,
+        texts=truth_texts,
+        ids_html=truth_ids_html,
+        texts_html=truth_texts_html,
+        index_by_id={truth_id: index for index, truth_id in enumerate(truth_ids)},
+        etags_html=etags_html,
+        etags_gzip=etags_gzip,
+        pages=truth_pages,
+        pages_gzip=truth_pages_gzip,
+    )
+    # Initialize hit counter. Hits are numbered by a C-level counter, so
+    # concurrent increments can never be lost; hit_counter holds the latest.
+    app.state.next_hit = itertools.count(1).__next__
+    app.state.hit_counter = 0
     yield
     # Shutdown
 
@@ -28,13 +80,35 @@ async def lifespan(app: FastAPI):
 def load_truths():
     """Load truths from JSON file"""
     try:
-        with open(settings.files.truth_file_path, 'r', encoding='utf-8') as file:
-            truths = json.load(file)
-        return truths
+        # Parse straight out of a read-only mapping of the file so the raw
+        # bytes are never copied into a separate Python object
+        with open(settings.files.truth_file_path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                memoryview(mapped) as buffer:
+            truths = orjson.loads(buffer)
     except FileNotFoundError:
-        raise Exception(f"Truth file not found at {settings.files.truth_file_path}")
-    except json.JSONDecodeError:
-        raise Exception(f"Invalid JSON in truth file at {settings.files.truth_file_path}")
+        raise TruthFileError(f"Truth file not found at {settings.files.truth_file_path}")
+    except ValueError:
+        # orjson.JSONDecodeError, or mmap refusing an empty file
+        raise TruthFileError(f"Invalid JSON in truth file at {settings.files.truth_file_path}")
+    
+    if not isinstance(truths, list) or not all(
+        isinstance(t, dict) and isinstance(t.get("id"), str) and isinstance(t.get("truth"), str)
+        for t in truths
+    ):
+        raise TruthFileError(
+            f"Truth file at {settings.files.truth_file_path} must be a list of "
+            f"objects with string id and truth"
+        )
+    # Building the set in one go is enough to detect duplicates; only count
+    # them when there are some to report
+    truth_ids = [t["id"] for t in truths]
+    if len(set(truth_ids)) != len(truth_ids):
+        duplicates = sorted(truth_id for truth_id, count in Counter(truth_ids).items() if count > 1)
+        raise TruthFileError(
+            f"Duplicate truth ids in {settings.files.truth_file_path}: {', '.join(duplicates)}"
+        )
+    return truths
 
 
 def create_app():
@@ -43,211 +117,270 @@ def create_app():
         title=settings.app.title,
         description=settings.app.description,
         version=settings.app.version,
+        default_response_class=ORJSONResponse,
         lifespan=lifespan
     )
 
-    # Add CORS middleware
+    # Serve the fixed-path endpoints without going through the router. Added
+    # first so it runs inside the rate limiter and CORS; the routes are
+    # registered once the endpoints below are defined.
+    fast_routes = {}
+    app.add_middleware(FastPathMiddleware, routes=fast_routes)
+
+    # Add rate limiting for the truth endpoints
     app.add_middleware(
-        CORSMiddleware,
-        allow_origins=settings.cors.allow_origins,
-        allow_credentials=settings.cors.allow_credentials,
-        allow_methods=settings.cors.allow_methods,
-        allow_headers=settings.cors.allow_headers,
+        RateLimitMiddleware,
+        path=settings.api.endpoints.truth,
+        max_requests=settings.rate_limit.max_requests,
+        window_seconds=settings.rate_limit.window_seconds,
     )
 
-    # Add rate limit exception handler
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    # Add CORS middleware, using the header-only variant when any origin is
+    # allowed without credentials, and skipping it when no origin is allowed
+    if settings.cors.allow_origins:
+        if settings.cors.allow_origins == ["*"] and not settings.cors.allow_credentials:
+            cors_middleware = WildcardCORSMiddleware
+        else:
+            cors_middleware = CORSMiddleware
+        app.add_middleware(
+            cors_middleware,
+            allow_origins=settings.cors.allow_origins,
+            allow_credentials=settings.cors.allow_credentials,
+            allow_methods=settings.cors.allow_methods,
+            allow_headers=settings.cors.allow_headers,
+        )
 
     # Include routers
     app.include_router(truth_router, prefix="")
 
-    @app.get(settings.api.endpoints.root, response_class=HTMLResponse)
-    async def root(request: Request):
-        """Root endpoint with API documentation"""
-        # Increment hit counter
-        app.state.hit_counter += 1
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>{settings.app.title}</title>
-            <meta name="viewport" content="width=device-width, initial-scale=1">
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    margin: 0;
-                    padding: 0;
-                    min-height: 100vh;
-                    display: flex;
-                    justify-content: center;
-                    align-items: center;
-                }}
-                .container {{
-                    background: white;
-                    border-radius: 15px;
-                    box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-                    padding: 40px;
-                    max-width: 800px;
-                    width: 90%;
-                    text-align: center;
-                    position: relative;
-                    overflow: hidden;
-                }}
-                .container::before {{
-                    content: '';
-                    position: absolute;
-                    top: 0;
-                    left: 0;
-                    right: 0;
-                    height: 5px;
-                    background: linear-gradient(90deg, #667eea, #764ba2);
-                }}
-                h1 {{
-                    color: #2c3e50;
-                    margin: 0 0 10px 0;
-                    font-size: 32px;
-                }}
-                .counter {{
-                    background: #e9ecef;
-                    color: #6c757d;
-                    display: inline-block;
-                    padding: 8px 16px;
-                    border-radius: 20px;
-                    font-size: 16px;
-                    font-weight: 600;
-                    margin: 0 0 20px 0;
-                }}
-                p {{
-                    color: #7f8c8d;
-                    font-size: 18px;
-                    line-height: 1.6;
-                    margin: 0 0 30px 0;
-                }}
-                .section {{
-                    background: #f8f9fa;
-                    border-radius: 10px;
-                    padding: 25px;
-                    margin: 20px 0;
-                    text-align: left;
-                    border: 1px solid #e9ecef;
-                }}
-                .section-title {{
-                    color: #2c3e50;
-                    margin: 0 0 15px 0;
-                    font-size: 20px;
-                    font-weight: 600;
-                }}
-                .endpoint {{
-                    background: white;
-                    padding: 12px 15px;
-                    margin: 10px 0;
-                    border-radius: 6px;
-                    border-left: 4px solid #667eea;
-                    font-family: monospace;
-                    font-size: 16px;
-                    color: #2c3e50;
-                }}
-                .rate-limit {{
-                    color: #e74c3c;
-                    font-size: 14px;
-                    margin-top: 5px;
-                    display: block;
-                }}
-                .example {{
-                    background: #2c3e50;
-                    color: white;
-                    padding: 12px 15px;
-                    border-radius: 6px;
-                    font-family: monospace;
-                    font-size: 14px;
-                    margin: 15px 0;
-                    overflow-x: auto;
-                }}
-                .btn {{
-                    display: inline-block;
-                    background: #667eea;
-                    color: white;
-                    text-decoration: none;
-                    padding: 12px 24px;
-                    border-radius: 25px;
-                    margin: 10px 5px;
-                    font-size: 16px;
-                    font-weight: 600;
-                    transition: all 0.3s ease;
-                    border: none;
-                    cursor: pointer;
-                }}
-                .btn:hover {{
-                    background: #5a6fd8;
-                    transform: translateY(-2px);
-                    box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-                }}
-                .btn-secondary {{
-                    background: #6c757d;
-                }}
-                .btn-secondary:hover {{
-                    background: #5a6268;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>{settings.app.title}</h1>
-                <div class="counter">API Hits: {app.state.hit_counter:,}</div>
-                <p>{settings.app.description}</p>
-                
-                <div class="section">
-                    <div class="section-title">Endpoints:</div>
-                    <div class="endpoint">
-                        GET {settings.api.endpoints.root}
-                        <div class="rate-limit">Returns this documentation page</div>
-                    </div>
-                    <div class="endpoint">
-                        GET {settings.api.endpoints.truth}
-                        <div class="rate-limit">Returns a random truth with shareable link • Rate Limit: {settings.rate_limit.max_requests} requests per hour</div>
-                    </div>
-                    <div class="endpoint">
-                        GET {settings.api.endpoints.health}
-                        <div class="rate-limit">Returns health status of the API</div>
-                    </div>
-                    <div class="endpoint">
-                        GET {settings.api.endpoints.truth}/{{truth_id}}
-                        <div class="rate-limit">Returns a specific truth by ID with shareable link</div>
-                    </div>
+    # The documentation page only varies by the hit counter, so render and
+    # encode the static parts around it once
+    rate_limit_text = describe_rate_limit(
+        settings.rate_limit.max_requests, settings.rate_limit.window_seconds
+    )
+    root_html = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>{settings.app.title}</title>
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <style>
+            body {{
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                margin: 0;
+                padding: 0;
+                min-height: 100vh;
+                display: flex;
+                justify-content: center;
+                align-items: center;
+            }}
+            .container {{
+                background: white;
+                border-radius: 15px;
+                box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+                padding: 40px;
+                max-width: 800px;
+                width: 90%;
+                text-align: center;
+                position: relative;
+                overflow: hidden;
+            }}
+            .container::before {{
+                content: '';
+                position: absolute;
+                top: 0;
+                left: 0;
+                right: 0;
+                height: 5px;
+                background: linear-gradient(90deg, #667eea, #764ba2);
+            }}
+            h1 {{
+                color: #2c3e50;
+                margin: 0 0 10px 0;
+                font-size: 32px;
+            }}
+            .counter {{
+                background: #e9ecef;
+                color: #6c757d;
+                display: inline-block;
+                padding: 8px 16px;
+                border-radius: 20px;
+                font-size: 16px;
+                font-weight: 600;
+                margin: 0 0 20px 0;
+            }}
+            p {{
+                color: #7f8c8d;
+                font-size: 18px;
+                line-height: 1.6;
+                margin: 0 0 30px 0;
+            }}
+            .section {{
+                background: #f8f9fa;
+                border-radius: 10px;
+                padding: 25px;
+                margin: 20px 0;
+                text-align: left;
+                border: 1px solid #e9ecef;
+            }}
+            .section-title {{
+                color: #2c3e50;
+                margin: 0 0 15px 0;
+                font-size: 20px;
+                font-weight: 600;
+            }}
+            .endpoint {{
+                background: white;
+                padding: 12px 15px;
+                margin: 10px 0;
+                border-radius: 6px;
+                border-left: 4px solid #667eea;
+                font-family: monospace;
+                font-size: 16px;
+                color: #2c3e50;
+            }}
+            .rate-limit {{
+                color: #e74c3c;
+                font-size: 14px;
+                margin-top: 5px;
+                display: block;
+            }}
+            .example {{
+                background: #2c3e50;
+                color: white;
+                padding: 12px 15px;
+                border-radius: 6px;
+                font-family: monospace;
+                font-size: 14px;
+                margin: 15px 0;
+                overflow-x: auto;
+            }}
+            .btn {{
+                display: inline-block;
+                background: #667eea;
+                color: white;
+                text-decoration: none;
+                padding: 12px 24px;
+                border-radius: 25px;
+                margin: 10px 5px;
+                font-size: 16px;
+                font-weight: 600;
+                transition: all 0.3s ease;
+                border: none;
+                cursor: pointer;
+            }}
+            .btn:hover {{
+                background: #5a6fd8;
+                transform: translateY(-2px);
+                box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
+            }}
+            .btn-secondary {{
+                background: #6c757d;
+            }}
+            .btn-secondary:hover {{
+                background: #5a6268;
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1>{settings.app.title}</h1>
+            <div class="counter">API Hits: {{hit_counter}}</div>
+            <p>{settings.app.description}</p>
+            
+            <div class="section">
+                <div class="section-title">Endpoints:</div>
+                <div class="endpoint">
+                    GET {settings.api.endpoints.root}
+                    <div class="rate-limit">Returns this documentation page</div>
                 </div>
-                
-                <div class="section">
-                    <div class="section-title">Rate Limiting:</div>
-                    <p>This API enforces a rate limit of {settings.rate_limit.max_requests} requests per hour per IP address.</p>
+                <div class="endpoint">
+                    GET {settings.api.endpoints.truth}
+                    <div class="rate-limit">Returns a random truth with shareable link • Rate Limit: {rate_limit_text}</div>
                 </div>
-                
-                <div class="section">
-                    <div class="section-title">Examples:</div>
-                    <div class="example">curl -X GET https://your-railway-app.railway.app{settings.api.endpoints.truth}</div>
-                    <div class="example">curl -X GET https://your-railway-app.railway.app{settings.api.endpoints.health}</div>
+                <div class="endpoint">
+                    GET {settings.api.endpoints.health}
+                    <div class="rate-limit">Returns health status of the API</div>
                 </div>
-                
-                <div>
-                    <a href="{settings.api.endpoints.truth}" class="btn">Get Random Truth</a>
-                    <a href="{settings.api.endpoints.health}" class="btn btn-secondary">Check Health</a>
+                <div class="endpoint">
+                    GET {settings.api.endpoints.truth}/{{truth_id}}
+                    <div class="rate-limit">Returns a specific truth by ID with shareable link</div>
                 </div>
             </div>
-        </body>
-        </html>
-        """
-        return HTMLResponse(content=html_content)
+            
+            <div class="section">
+                <div class="section-title">Rate Limiting:</div>
+                <p>This API enforces a rate limit of {rate_limit_text} per IP address.</p>
+            </div>
+            
+            <div class="section">
+                <div class="section-title">Examples:</div>
+                <div class="example">curl -X GET https://your-railway-app.railway.app{settings.api.endpoints.truth}</div>
+                <div class="example">curl -X GET https://your-railway-app.railway.app{settings.api.endpoints.health}</div>
+            </div>
+            
+            <div>
+                <a href="{settings.api.endpoints.truth}" class="btn">Get Random Truth</a>
+                <a href="{settings.api.endpoints.health}" class="btn btn-secondary">Check Health</a>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    root_html_head, root_html_tail = (
+        part.encode("utf-8") for part in root_html.split("{hit_counter}", 1)
+    )
+
+    @app.get(settings.api.endpoints.root, response_class=HTMLResponse)
+    async def root(request: Request):
+        """Root endpoint with API documentation"""
+        # Increment hit counter
+        app.state.hit_counter = hit = app.state.next_hit()
+        hits = f"{hit:,}".encode("utf-8")
+        return HTMLResponse(content=root_html_head + hits + root_html_tail)
+
+    # Health checks are polled aggressively, so everything before the hit
+    # counter is serialized at most once per second:
+    # [monotonic serialized_at, b'{"status":...,"timestamp":...,"hit_counter":']
+    health_payload = [float("-inf"), b""]
+    version = settings.app.version
+    # Bound here rather than as default arguments, which FastAPI would expose
+    # as query parameters. The throttle runs on the monotonic clock so a wall
+    # clock step backwards cannot freeze the timestamp; the wall clock is
+    # only read to format it.
+    monotonic = time.monotonic
+    wall_clock = time.time
+    utc_from_timestamp = datetime.utcfromtimestamp
 
     @app.get(settings.api.endpoints.health)
     async def health_check():
         """Health check endpoint"""
-        return {
-            "status": "healthy",
-            "version": settings.app.version,
-            "timestamp": datetime.utcnow().isoformat(),
-            "hit_counter": app.state.hit_counter
-        }
+        now = monotonic()
+        if now - health_payload[0] >= 1.0:
+            health_payload[0] = now
+            health_payload[1] = orjson.dumps({
+                "status": "healthy" if app.state.ready else "degraded",
+                "version": version,
+                "timestamp": utc_from_timestamp(wall_clock()).isoformat()
+            })[:-1] + b',"hit_counter":'
+
+        return Response(
+            content=health_payload[1] + b"%d}" % app.state.hit_counter,
+            # Health checks go by status code: keep a degraded instance out
+            # of rotation rather than letting it answer /truth with 500s
+            status_code=200 if app.state.ready else 503,
+            media_type="application/json"
+        )
+
+    async def fast_health_check(request: Request):
+        return await health_check()
+
+    fast_routes.update({
+        settings.api.endpoints.root: root,
+        settings.api.endpoints.health: fast_health_check,
+        settings.api.endpoints.truth: get_random_truth,
+    })
 
     return app
 
@@ -1 +1,7 @@
+from .cors import WildcardCORSMiddleware
+from .fast_path import FastPathMiddleware
+from .rate_limiter import RateLimitMiddleware, describe_rate_limit
 
+__all__ = [
+    "FastPathMiddleware", "RateLimitMiddleware", "WildcardCORSMiddleware", "describe_rate_limit"
+]
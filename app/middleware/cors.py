@@ -0,0 +1,26 @@
+from starlette.middleware.cors import CORSMiddleware
+
+_ALLOW_ANY_ORIGIN = (b"access-control-allow-origin", b"*")
+
+
+class WildcardCORSMiddleware(CORSMiddleware):
+    """
+    CORS middleware for allow_origins=["*"] without credentials
+
+    Simple requests only need a constant allow-origin header, so the request
+    headers are not parsed. Preflight requests go through CORSMiddleware.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await super().__call__(scope, receive, send)
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                # Copy rather than append: the header list may belong to a
+                # shared response object
+                message["headers"] = [*message.get("headers", ()), _ALLOW_ANY_ORIGIN]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
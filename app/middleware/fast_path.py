@@ -0,0 +1,25 @@
+from starlette.requests import Request
+
+
+class FastPathMiddleware:
+    """
+    Dispatch GET requests for fixed paths straight to their endpoints
+
+    Each endpoint takes the Request and returns a Response, so these paths
+    skip the router's route scan and FastAPI's dependency solving. Anything
+    not in ``routes`` falls through to the application.
+    """
+
+    def __init__(self, app, routes: dict):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "GET":
+            endpoint = self.routes.get(scope["path"])
+            if endpoint is not None:
+                response = await endpoint(Request(scope, receive))
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
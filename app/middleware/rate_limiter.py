@@ -1 +1,82 @@
+import math
+import orjson
+from time import monotonic
+from starlette.responses import Response
 
+
+def describe_rate_limit(max_requests: int, window_seconds: int) -> str:
+    """Describe the rate limit in the largest whole time unit, e.g. 20 requests per hour"""
+    for unit, seconds in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if window_seconds % seconds == 0:
+            count = window_seconds // seconds
+            break
+    else:
+        unit, count = "second", window_seconds
+    period = unit if count == 1 else f"{count} {unit}s"
+    return f"{max_requests} requests per {period}"
+
+
+class RateLimitMiddleware:
+    """
+    Token-bucket rate limiter keyed by client IP, applied to one path prefix
+
+    Each client holds up to ``max_requests`` tokens, refilled continuously at
+    ``max_requests / window_seconds`` per second; a request spends one token.
+    """
+
+    def __init__(self, app, path: str, max_requests: int, window_seconds: int):
+        self.app = app
+        self.path = path
+        self.path_prefix = path.rstrip("/") + "/"
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.rate = max_requests / window_seconds
+        # client -> (tokens left, time of last update)
+        self._buckets = {}
+        self._next_sweep = monotonic()
+        self._body = orjson.dumps({
+            "error": f"Rate limit exceeded: {describe_rate_limit(max_requests, window_seconds)}"
+        })
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (
+            scope["path"] == self.path or scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Only elapsed time matters, so use a clock that wall-clock
+        # adjustments cannot move
+        now = monotonic()
+        if now >= self._next_sweep:
+            # A bucket untouched for a whole window is full again, which is
+            # the same as having no entry; drop those to bound memory
+            cutoff = now - self.window_seconds
+            self._buckets = {
+                key: bucket for key, bucket in self._buckets.items() if bucket[1] > cutoff
+            }
+            self._next_sweep = now + self.window_seconds
+
+        client = scope.get("client")
+        key = client[0] if client else "unknown"
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = self.max_requests
+        else:
+            tokens, last = bucket
+            tokens = min(self.max_requests, tokens + (now - last) * self.rate)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            retry_after = math.ceil((1 - tokens) / self.rate)
+            response = Response(
+                content=self._body,
+                status_code=429,
+                media_type="application/json",
+                headers={"Retry-After": str(retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        self._buckets[key] = (tokens - 1, now)
+        await self.app(scope, receive, send)
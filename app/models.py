@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, NamedTuple, Optional, Tuple
 
 
 class TruthEntry(BaseModel):
@@ -17,3 +17,23 @@ class HealthCheckResponse(BaseModel):
     status: str
     uptime: Optional[str] = None
     version: str
+
+
+class TruthCorpus(NamedTuple):
+    """
+    The loaded truths in column layout, built once at startup
+
+    Every tuple is indexed by the same position. Stored as one object on
+    ``app.state`` so handlers pay a single State lookup and then use plain
+    tuple attribute access.
+    """
+    ids: Tuple[str, ...]
+    texts: Tuple[str, ...]
+    ids_html: Tuple[str, ...]
+    texts_html: Tuple[str, ...]
+    index_by_id: Dict[str, int]
+    etags_html: Tuple[str, ...]
+    etags_gzip: Tuple[str, ...]
+    # Pre-rendered pages per refresh action, or None without a base URL
+    pages: Optional[Dict[str, Tuple[bytes, ...]]]
+    pages_gzip: Optional[Dict[str, Tuple[bytes, ...]]]
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LazySettingsTest(unittest.TestCase):
+    def test_import_does_not_load_settings(self):
+        """Importing app.config must not parse settings or import yaml"""
+        # A fresh interpreter with the JSON cache disabled, so a warm cache
+        # cannot hide an eager YAML load
+        env = dict(os.environ, TRUTH_API_NO_CACHE="1", PYTHONPATH=ROOT)
+        code = (
+            "import sys, app.config\n"
+            "assert 'yaml' not in sys.modules, 'yaml imported'\n"
+            "assert app.config._settings is None, 'settings loaded'\n"
+            "assert 'app.main' not in sys.modules, 'app built'\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()